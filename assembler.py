@@ -1,17 +1,18 @@
 # RICCARDO SAMARITAN SM3201396
 
-from lmc import LMC
+from lmc_config import DEFAULT_CONFIG
 from lmc_exceptions import *
 
 class Assembler:
 
-    def __init__(self, filename):
+    def __init__(self, filename, config=DEFAULT_CONFIG):
         """
         Initializes the Assembler object, responsible for loading and analyzing the assembly code.
 
         :parameter filename: The name of the file containing the assembly code.
+        :parameter config: The LMCConfig used to encode instructions.
         """
-        self.lmc = LMC() 
+        self.config = config
         self.filename = filename
         self.labels = {}
         self.instructions_dict = {
@@ -22,8 +23,8 @@ class Assembler:
             "BRA": 6,
             "BRZ": 7,
             "BRP": 8,
-            "INP": 901,
-            "OUT": 902,
+            "INP": config.encode(9, 1),
+            "OUT": config.encode(9, 2),
             "HLT": 0,
             "DAT": None
         }
@@ -37,10 +38,7 @@ class Assembler:
         instr = []
         try:
             with open(self.filename, 'r') as f:
-                for line in f:
-                    line = line.split('//')[0].strip()  # Removes comments (anything after '//') and spaces.
-                    if line:
-                        instr.append(self.normalizeInstruction(line))  # Adds the normalized instruction.
+                instr = self.loadInstructionsFromLines(f)
         except FileNotFoundError:
             print(f"Error: The file '{self.filename}' was not found.")
         except Exception as e:
@@ -48,6 +46,20 @@ class Assembler:
 
         return instr
 
+    def loadInstructionsFromLines(self, lines):
+        """
+        Normalizes assembly instructions given as an iterable of source lines (e.g. an open file or a string split into lines).
+
+        :parameter lines: The lines of assembly code.
+        :returns: A list of normalized instructions.
+        """
+        instr = []
+        for line in lines:
+            line = line.split('//')[0].strip()  # Removes comments (anything after '//') and spaces.
+            if line:
+                instr.append(self.normalizeInstruction(line))  # Adds the normalized instruction.
+        return instr
+
     def normalizeInstruction(self, instruction):
         """
         Normalizes the instruction: converts it to uppercase and removes extra spaces.
@@ -63,24 +75,31 @@ class Assembler:
 
         :parameter instruction: The instruction to analyze.
         :returns: A list containing the opcode and the operand.
+        :raises InstructionNotFoundException: If the instruction is not valid.
+        :raises LabelNotFoundException: If the operand is neither a number nor a known label.
         """
-        machine_code = 0
+        opcode = self.parseInstructionOpcode([instruction[0]])  # Gets the opcode for the instruction.
         try:
-            opcode = self.parseInstructionOpcode([instruction[0]])  # Gets the opcode for the instruction.
             operand = int(instruction[1])  # Converts the operand to an integer.
-        except InstructionNotFoundException:
-            pass  
         except ValueError:
-            try:
-                # If operand is not a number, it might be a label.
-                machine_code += self.get_label_address()(instruction[1])
-            except LabelNotFoundException:
-                pass
-        except Exception:
-            print("Unexpected error occurred during action parsing.")
+            # If operand is not a number, it might be a label.
+            operand = self.get_label_address(instruction[1])
 
         return [opcode, operand]  # Returns the machine code of the instruction.
 
+    def convertInstructionToMachineCode(self, instruction):
+        """
+        Parses a single resolved assembly instruction into machine code.
+
+        :parameter instruction: The instruction to parse, split into words.
+        :returns: Machine code corresponding to the instruction.
+        """
+        if len(instruction) == 2:  # Action instruction with operand.
+            return self.parseActionInstruction(instruction)
+        elif len(instruction) == 1:  # Input/Output instruction.
+            return self.parseIoInstruction(instruction)
+        raise ValueError("Invalid instruction format.")  # Handle unexpected instruction format.
+
     def parseIoInstruction(self, instruction):
         """
         Analyzes an input/output instruction (e.g., 'INP', 'OUT') and returns its machine code.
@@ -97,7 +116,7 @@ class Assembler:
             return [None, value]  # Returns None if the instruction is not valid.
 
         # Returns the machine code split into two parts (opcode and operand).
-        return [value // 100, value % 100]
+        return list(self.config.decode(value))
 
     def parseInstructionOpcode(self, instruction):
         """
@@ -120,7 +139,7 @@ class Assembler:
         # Checks if the word exists in the instructions dictionary.
         if word in self.instructions_dict:
             return self.instructions_dict[word]
-        raise InstructionNotFoundException  # Raises an exception if the word is not found.
+        raise InstructionNotFoundException(f"Unknown instruction: {word}")  # Raises an exception if the word is not found.
 
     def extractLabels(self, instructions):
         """
@@ -164,4 +183,4 @@ class Assembler:
         # If the label exists in the dictionary, return its memory address.
         if label in self.labels:
             return self.labels[label]
-        raise LabelNotFoundException  # Raises an exception if the label is not found.
+        raise LabelNotFoundException(f"Unknown label: {label}")  # Raises an exception if the label is not found.
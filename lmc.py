@@ -1,29 +1,45 @@
 # RICCARDO SAMARITAN SM3201396
 
+import time
+
+from lmc_config import DEFAULT_CONFIG
 from lmc_exceptions import *
 from lmc_queue import LMC_Queue
 from memory_cell import MemoryCell
 
-MIN_VALUE = 0
-MAX_VALUE = 999
-MEMORY_SIZE = 100
+# Limits of the classic LMC, kept for code that imports them directly
+MIN_VALUE = DEFAULT_CONFIG.min_value
+MAX_VALUE = DEFAULT_CONFIG.max_value
+MEMORY_SIZE = DEFAULT_CONFIG.memory_size
 
 class LMC:
     """
     Simulates the Little Man Computer (LMC), a simple model of a CPU with memory, 
     input/output queues, and basic instructions.
     """
-    def __init__(self):
+    def __init__(self, config=DEFAULT_CONFIG):
         """
         Initializes the LMC with memory, registers, and I/O queues.
+
+        :param config: The LMCConfig describing word width, address width and memory size.
         """
-        self.memory = [MemoryCell(content=0) for _ in range(MEMORY_SIZE)]  # Memory cells
+        self.config = config
+        # Limits copied from the configuration so the execution loop reads plain attributes
+        self.min_value = config.min_value
+        self.max_value = config.max_value
+        self.word_limit = config.word_limit
+        self.memory_size = config.memory_size
+
+        self.memory = [MemoryCell(content=0, config=config) for _ in range(config.memory_size)]  # Memory cells
         self.accumulator = 0  # Register to hold arithmetic results
         self.program_counter = 0  # Tracks the current instruction address
         self.input_queue = LMC_Queue()  # Queue for input values
         self.output_queue = LMC_Queue()  # Queue for output values
         self.overflow_flag = False  # Indicates arithmetic overflow
         self.halted = False  # Indicates if the program has halted
+        self.instructions_executed = 0  # Number of instructions executed so far
+        self.stats = None  # LMCStats collecting execution statistics, if enabled
+        self._stepwise_run = None  # [instructions, wall time, input queue peak] of the current stepwise run
 
         # Mapping opcodes to corresponding methods
         self.instruction_set = {
@@ -37,31 +53,6 @@ class LMC:
             9: self._handle_input_output
         }
 
-    def fetchNextInstruction(self):
-        """
-        Fetches the next instruction from memory and increments the program counter.
-
-        :returns: The current memory cell containing the instruction.
-        :raises IndexError: If the program counter is out of bounds.
-        """
-        if not (0 <= self.program_counter < MEMORY_SIZE):
-            raise IndexError("Program counter out of bounds.")
-        cell = self.memory[self.program_counter]
-        self.program_counter += 1
-        return cell
-
-    def executeInstruction(self, cell: MemoryCell):
-        """
-        Decodes and executes the instruction in the given memory cell.
-
-        :param cell: The memory cell containing the instruction.
-        :raises ValueError: If the opcode is invalid.
-        """
-        if cell.opcode in self.instruction_set:
-            self.instruction_set[cell.opcode](cell.address)
-        else:
-            raise ValueError(f"Invalid opcode: {cell.opcode}")
-
     def _add(self, address: int):
         """
         Adds the value at the specified memory address to the accumulator.
@@ -69,8 +60,8 @@ class LMC:
         :param address: Memory address to fetch the value from.
         """
         value = self.getMemoryCellValue(address)
-        self.accumulator = (self.accumulator + value) % 1000
-        self.overflow_flag = not (MIN_VALUE <= self.accumulator <= MAX_VALUE)
+        self.accumulator = (self.accumulator + value) % self.word_limit
+        self.overflow_flag = not (self.min_value <= self.accumulator <= self.max_value)
 
     def _subtract(self, address: int):
         """
@@ -79,8 +70,8 @@ class LMC:
         :param address: Memory address to fetch the value from.
         """
         value = self.getMemoryCellValue(address)
-        self.accumulator = (self.accumulator - value) % 1000
-        self.overflow_flag = not (MIN_VALUE <= self.accumulator <= MAX_VALUE)
+        self.accumulator = (self.accumulator - value) % self.word_limit
+        self.overflow_flag = not (self.min_value <= self.accumulator <= self.max_value)
 
     def _store(self, address: int):
         """
@@ -150,9 +141,9 @@ class LMC:
             self.input_queue.enqueue(value)
         for i, (opcode, address) in enumerate(machine_codes):
             if opcode is not None:
-                self.memory[i] = MemoryCell(opcode=opcode, address=address)
+                self.memory[i] = MemoryCell(opcode=opcode, address=address, config=self.config)
             else:
-                self.memory[i] = MemoryCell(content=address)
+                self.memory[i] = MemoryCell(content=address, config=self.config)
 
     def getMemoryCellValue(self, address: int) -> int:
         """
@@ -171,31 +162,123 @@ class LMC:
         :parameter address: Memory address to validate.
         :raises IndexError: If the address is out of bounds.
         """
-        if not (0 <= address < MEMORY_SIZE):
+        if not (0 <= address < self.memory_size):
             raise IndexError(f"Address {address} out of bounds.")
 
-    def executeProgram(self):
+    def enableStats(self, stats=None):
         """
-        Executes the program until a HALT instruction is encountered.
+        Enables the collection of execution statistics.
+
+        :param stats: The LMCStats to record runs into (default: a new LMCStats).
+        :returns: The LMCStats in use.
         """
-        while not self.halted:
-            self.executeSingleInstruction()
+        if stats is None:
+            from lmc_stats import LMCStats  # Imported on demand, so runs without statistics do not load it
+            stats = LMCStats()
+        self.stats = stats
+        return self.stats
+
+    def executeProgram(self, max_steps=None):
+        """
+        Executes the program until a HALT instruction is encountered, recording the run in
+        self.stats if statistics are enabled.
+
+        :param max_steps: Maximum number of instructions to execute (default: no limit).
+        :raises StepLimitExceededException: If the program does not halt within max_steps instructions.
+        """
+        if max_steps is not None and max_steps < 0:
+            raise ValueError("max_steps must not be negative.")
+        if self.halted:
+            return
+        stats = self.stats
+        start_count = self.instructions_executed
+        token = stats.beginRun(self) if stats is not None else None
+        try:
+            self._executeInstructions(-1 if max_steps is None else max_steps)
+            if not self.halted:
+                raise StepLimitExceededException(f"Program did not halt within {max_steps} steps.")
+        finally:
+            if stats is not None:
+                stats.endRun(token, self, self.instructions_executed - start_count)
+
+    def _executeInstructions(self, limit):
+        """
+        Fetches, decodes and executes instructions until the program halts or limit instructions
+        have been executed. This is the only implementation of the instruction cycle: every
+        execution mode goes through it, and the executed instructions are added to
+        self.instructions_executed even if an instruction fails.
+
+        :param limit: Maximum number of instructions to execute, or -1 for no limit.
+        :raises IndexError: If the program counter is out of bounds.
+        :raises HaltException: If a data cell is reached.
+        :raises ValueError: If the opcode is invalid.
+        """
+        memory = self.memory
+        memory_size = self.memory_size
+        instruction_set = self.instruction_set
+        executed = 0
+        try:
+            while executed != limit and not self.halted:
+                pc = self.program_counter
+                if not (0 <= pc < memory_size):
+                    raise IndexError("Program counter out of bounds.")
+                cell = memory[pc]
+                self.program_counter = pc + 1
+                opcode = cell.opcode
+                if opcode is None:
+                    raise HaltException("Data interpreted as instruction.")
+                if opcode == 0:  # HALT
+                    self.halted = True
+                else:
+                    instruction = instruction_set.get(opcode)
+                    if instruction is None:
+                        raise ValueError(f"Invalid opcode: {opcode}")
+                    instruction(cell.address)
+                executed += 1
+        finally:
+            self.instructions_executed += executed
 
     def executeProgramStepwise(self):
         """
         Executes the program one instruction at a time.
+
+        With statistics enabled, only the time spent executing instructions is measured and the
+        run is recorded once the program halts or fails; allocations are not sampled.
         """
-        if not self.halted:
+        if self.halted:
+            return
+        if self.stats is None:
             self.executeSingleInstruction()
+            return
+
+        if self._stepwise_run is None:
+            self._stepwise_run = [0, 0.0, len(self.input_queue.items)]
+        run = self._stepwise_run
+        start = time.perf_counter()
+        try:
+            self.executeSingleInstruction()
+            run[0] += 1
+        except Exception:
+            self._recordStepwiseRun(time.perf_counter() - start)
+            raise
+        if self.halted:
+            self._recordStepwiseRun(time.perf_counter() - start)
+        else:
+            run[1] += time.perf_counter() - start
+
+    def _recordStepwiseRun(self, last_step_time):
+        """
+        Records the current stepwise run in self.stats.
+
+        :param last_step_time: Execution time of the last step, not yet added to the run.
+        """
+        instructions, wall_time, input_queue_peak = self._stepwise_run
+        self._stepwise_run = None
+        self.stats.recordRun(instructions, wall_time + last_step_time, input_queue_peak,
+                             len(self.output_queue.items))
 
     def executeSingleInstruction(self):
         """
-        Executes a single instruction in the program.
+        Executes a single instruction in the program, unless it has already halted.
         """
-        cell = self.fetchNextInstruction()
-        if cell.opcode is None:
-            raise HaltException("Data interpreted as instruction.")
-        if cell.opcode == 0:  # HALT
-            self.halted = True
-        else:
-            self.executeInstruction(cell)
\ No newline at end of file
+        self._executeInstructions(1)
\ No newline at end of file
@@ -0,0 +1,82 @@
+# RICCARDO SAMARITAN SM3201396
+
+class LMCConfig:
+    """
+    Describes the shape of a Little Man Computer: how many decimal digits make up a word,
+    how many of those digits encode an address, and how many memory cells are available.
+
+    The classic LMC uses 3-digit words, 2-digit addresses and 100 memory cells; larger
+    variants (e.g. 6-digit words, 4-digit addresses and 10,000 cells) can be described
+    by passing different values.
+    """
+    def __init__(self, word_digits=3, address_digits=2, memory_size=None):
+        """
+        Initializes the configuration and precomputes the derived limits.
+
+        :param word_digits: Number of decimal digits in a memory word.
+        :param address_digits: Number of decimal digits used by the address field of an instruction.
+        :param memory_size: Number of memory cells (default: every address that fits in address_digits).
+        :raises ValueError: If the values do not describe a valid machine.
+        """
+        if not _is_int(word_digits) or not _is_int(address_digits):
+            raise ValueError("Word and address widths must be integers.")
+        if address_digits < 1 or word_digits <= address_digits:
+            raise ValueError("Word width must be greater than address width, which must be at least 1.")
+
+        self.word_digits = word_digits
+        self.address_digits = address_digits
+        self.address_limit = 10 ** address_digits  # Number of distinct values of the address field
+        self.word_limit = 10 ** word_digits  # Number of distinct word values (used as arithmetic modulus)
+
+        if memory_size is None:
+            memory_size = self.address_limit
+        if not _is_int(memory_size) or not (1 <= memory_size <= self.address_limit):
+            raise ValueError(f"Memory size must be an integer between 1 and {self.address_limit}.")
+        self.memory_size = memory_size
+
+        self.min_value = 0
+        self.max_value = self.word_limit - 1
+        self.max_address = self.address_limit - 1
+        self.max_opcode = self.word_limit // self.address_limit - 1
+
+    def encode(self, opcode, address):
+        """
+        Encodes an opcode and an address into a single word.
+
+        :param opcode: The opcode of the instruction.
+        :param address: The address field of the instruction.
+        :returns: The encoded word.
+        """
+        return opcode * self.address_limit + address
+
+    def decode(self, word):
+        """
+        Splits a word into its opcode and address fields.
+
+        :param word: The word to decode.
+        :returns: A tuple (opcode, address).
+        """
+        return divmod(word, self.address_limit)
+
+    def __eq__(self, other):
+        if not isinstance(other, LMCConfig):
+            return NotImplemented
+        return (self.word_digits, self.address_digits, self.memory_size) == \
+            (other.word_digits, other.address_digits, other.memory_size)
+
+    def __hash__(self):
+        return hash((self.word_digits, self.address_digits, self.memory_size))
+
+    def __repr__(self):
+        return (f"LMCConfig(word_digits={self.word_digits}, "
+                f"address_digits={self.address_digits}, memory_size={self.memory_size})")
+
+
+def _is_int(value):
+    """
+    Checks whether a value is an integer; booleans are rejected even though bool subclasses int.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+DEFAULT_CONFIG = LMCConfig()
@@ -16,6 +16,11 @@ class EmptyInputQueueException(Exception):
         self.message = message
 
 class HaltException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+class StepLimitExceededException(Exception):
     def __init__(self, message):
         super().__init__(message)
         self.message = message
\ No newline at end of file
@@ -0,0 +1,332 @@
+# RICCARDO SAMARITAN SM3201396
+
+"""
+Non-interactive entry points for running LMC programs from scripts and job runners.
+
+``run_program`` assembles and executes a program given as source code and returns its result
+as a dictionary; ``run_job`` does the same for a JSON job description. The ``run`` and ``serve``
+commands (dispatched from main.py) expose them on the command line, writing one JSON line per
+result, so that a long-lived ``serve`` process pays interpreter startup and imports only once.
+"""
+
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from functools import lru_cache
+
+from assembler import Assembler
+from lmc import LMC
+from lmc_config import DEFAULT_CONFIG, LMCConfig
+from lmc_stats import LMCStats
+
+EXIT_OK = 0  # Every program halted normally
+EXIT_FAILURE = 1  # At least one program could not be loaded, assembled or executed
+
+
+def parse_input(text):
+    """
+    Parses an input queue written as integers separated by commas and/or whitespace.
+
+    :param text: The text to parse.
+    :returns: A list of integers.
+    :raises ValueError: If a value is not an integer.
+    """
+    return [int(x) for x in text.replace(",", " ").split()]
+
+
+@lru_cache(maxsize=128)
+def assemble(source, config=DEFAULT_CONFIG):
+    """
+    Assembles a program into machine codes. Results are cached, so a serving process
+    assembles each distinct program only once.
+
+    :param source: The assembly code.
+    :param config: The LMCConfig to assemble for.
+    :returns: A tuple of (opcode, address) machine codes.
+    """
+    assembler = Assembler("<source>", config)
+    instructions = assembler.loadInstructionsFromLines(source.splitlines())
+    resolved_instructions = assembler.extractLabels(instructions)
+    assembler.substituteLabelsWithAddresses(resolved_instructions)
+    return tuple(tuple(assembler.convertInstructionToMachineCode(instruction))
+                 for instruction in resolved_instructions)
+
+
+def run_program(source, input_data=(), config=DEFAULT_CONFIG, max_steps=None, stats=None):
+    """
+    Assembles and executes a program until it halts, without printing anything.
+
+    :param source: The assembly code.
+    :param input_data: Values for the input queue.
+    :param config: The LMCConfig describing the machine.
+    :param max_steps: Maximum number of instructions to execute (default: no limit).
+    :param stats: LMCStats to record the run into (default: no statistics).
+    :returns: A dictionary with the status, output queue, final registers, number of executed
+              instructions, the run statistics if enabled and, on failure, the error type and message.
+    """
+    result = {"status": "ok", "output": [], "accumulator": None, "program_counter": None, "steps": 0}
+    lmc = None
+    try:
+        machine_codes = assemble(source, config)
+        lmc = LMC(config)
+        lmc.initializeMemory(machine_codes, list(input_data))
+        if stats is not None:
+            lmc.enableStats(stats)
+        lmc.executeProgram(max_steps)
+    except Exception as e:
+        result["status"] = "error"
+        result["error_type"] = type(e).__name__
+        result["error"] = str(e)
+
+    if lmc is not None:
+        result["output"] = list(lmc.output_queue.items)
+        result["accumulator"] = lmc.accumulator
+        result["program_counter"] = lmc.program_counter
+        result["steps"] = lmc.instructions_executed
+        if lmc.stats is not None:
+            result["stats"] = stats.last_run
+    return result
+
+
+def run_job(job, defaults=None, stats=None):
+    """
+    Runs a job described by a dictionary, as read from a JSON line.
+
+    Recognized keys: "id" (echoed back), "program" (path of an assembly file) or "source"
+    (assembly code), "input" (list of integers or a comma-separated string), "word_digits",
+    "address_digits", "memory_size" and "max_steps". Missing keys are taken from defaults.
+
+    :param job: The job description.
+    :param defaults: Default values for the keys above.
+    :param stats: LMCStats to record the run into (default: no statistics).
+    :returns: The result dictionary of run_program, with "id" and "program" added when given.
+    """
+    settings = dict(defaults or {})
+    settings.update(job)
+    result = {}
+    if "id" in settings:
+        result["id"] = settings["id"]
+    if "program" in settings:
+        result["program"] = settings["program"]
+
+    try:
+        if "source" in settings:
+            source = settings["source"]
+        elif "program" in settings:
+            with open(settings["program"], "r") as f:
+                source = f.read()
+        else:
+            raise ValueError("Job must provide either 'program' or 'source'.")
+
+        input_data = settings.get("input") or []
+        if isinstance(input_data, str):
+            input_data = parse_input(input_data)
+        if not isinstance(input_data, list) or not all(_is_int(value) for value in input_data):
+            raise ValueError("'input' must be a list of integers or a comma-separated string.")
+        config = LMCConfig(
+            _int_setting(settings, "word_digits", 3),
+            _int_setting(settings, "address_digits", 2),
+            _int_setting(settings, "memory_size", None),
+        )
+        max_steps = _int_setting(settings, "max_steps", None)
+    except Exception as e:
+        result.update(status="error", output=[], accumulator=None, program_counter=None, steps=0,
+                      error_type=type(e).__name__, error=str(e))
+        return result
+
+    result.update(run_program(source, input_data, config, max_steps, stats))
+    return result
+
+
+def _is_int(value):
+    """
+    Checks whether a JSON value is an integer (JSON booleans are not).
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _int_setting(settings, key, default):
+    """
+    Gets an integer job setting, which may also be null when the default is None.
+
+    :raises ValueError: If the value is not an integer.
+    """
+    value = settings.get(key, default)
+    if value is None and default is None:
+        return None
+    if not _is_int(value):
+        raise ValueError(f"'{key}' must be an integer.")
+    return value
+
+
+def serve_stream(infile, outfile, defaults=None, stats=None, stats_file=None, lock=None):
+    """
+    Reads jobs as JSON lines from infile and writes one JSON result line per job to outfile.
+    Blank lines are ignored.
+
+    :param infile: Text stream to read jobs from.
+    :param outfile: Text stream to write results to.
+    :param defaults: Default job settings (see run_job).
+    :param stats: LMCStats to record the runs into (default: no statistics).
+    :param stats_file: File rewritten in the Prometheus text format at most once a second while
+                       jobs run and once more at the end of the stream
+                       (a new LMCStats is used if stats is not given).
+    :param lock: Lock held while a job runs, when several streams share stats (default: none).
+    :returns: EXIT_OK if every job succeeded, EXIT_FAILURE otherwise.
+    """
+    if stats_file and stats is None:
+        stats = LMCStats()
+    if lock is None:
+        lock = nullcontext()
+    exit_code = EXIT_OK
+    for line in infile:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("Job must be a JSON object.")
+        except ValueError as e:
+            result = {"status": "error", "error_type": type(e).__name__, "error": str(e)}
+        else:
+            with lock:
+                result = run_job(job, defaults, stats)
+                if stats_file:
+                    stats.writePrometheusIfDue(stats_file)
+        if result["status"] != "ok":
+            exit_code = EXIT_FAILURE
+        outfile.write(json.dumps(result) + "\n")
+        outfile.flush()
+    if stats_file:
+        with lock:
+            stats.writePrometheus(stats_file)
+    return exit_code
+
+
+def serve_socket(path, defaults=None, stats=None, stats_file=None):
+    """
+    Serves jobs over a Unix socket; each connection is handled like serve_stream in its own
+    thread, so a long-lived client does not block the others. Runs until interrupted.
+
+    Jobs from different connections run one at a time: they share the LMCStats and the
+    process-wide tracemalloc state, and the interpreter lock would not let them run in
+    parallel anyway. Bytes that are not valid UTF-8 make their line fail as an invalid job.
+
+    :param path: Filesystem path of the socket.
+    :param defaults: Default job settings (see run_job).
+    :param stats: LMCStats to record the runs into (default: no statistics).
+    :param stats_file: File rewritten in the Prometheus text format at most once a second while
+                       jobs run, at the end of each connection and at shutdown
+                       (a new LMCStats, shared by all connections, is used if stats is not given).
+    """
+    import io
+    import os
+    import signal
+    import socketserver
+    import stat
+    import threading
+
+    job_lock = threading.Lock()
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            infile = io.TextIOWrapper(self.rfile, encoding="utf-8", errors="replace")
+            outfile = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            serve_stream(infile, outfile, defaults, stats, stats_file, job_lock)
+            infile.detach()
+            outfile.detach()
+
+    if stats_file and stats is None:
+        stats = LMCStats()
+
+    # Removes a socket left behind by a previous server, but never any other kind of file.
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.unlink(path)
+
+    # Turns SIGTERM into a normal exit so the socket file is removed when a job runner stops the server.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(EXIT_OK))
+
+    with socketserver.ThreadingUnixStreamServer(path, JobHandler) as server:
+        server.daemon_threads = True  # Open client connections do not keep the process alive on exit
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+            if stats_file:
+                with job_lock:
+                    stats.writePrometheus(stats_file)
+
+
+def _read_text(path):
+    """
+    Reads a whole file, or standard input if the path is '-'.
+    """
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r") as f:
+        return f.read()
+
+
+def main(argv=None):
+    """
+    Command-line entry point for the 'run' and 'serve' commands.
+
+    :param argv: Command-line arguments, starting with the command name (default: sys.argv[1:]).
+    :returns: The process exit code.
+    """
+    parser = argparse.ArgumentParser(prog="main.py", description="Run LMC Assembly programs non-interactively.")
+    machine = argparse.ArgumentParser(add_help=False)
+    machine.add_argument("--word-digits", type=int, default=3, help="Number of decimal digits in a memory word. Default is 3.")
+    machine.add_argument("--address-digits", type=int, default=2, help="Number of decimal digits in an address. Default is 2.")
+    machine.add_argument("--memory-size", type=int, default=None, help="Number of memory cells. Default is every address that fits in --address-digits.")
+    machine.add_argument("--max-steps", type=int, default=None, help="Stop a program with an error after this many instructions. Default is no limit.")
+    machine.add_argument("--stats", action="store_true", help="Collect execution statistics and include them in the results.")
+    machine.add_argument("--stats-file", help="Write execution statistics to this file in the Prometheus text format (implies --stats).")
+    machine.add_argument("--alloc-sample-interval", type=int, default=None, help="Measure allocations with tracemalloc on one run out of this many (0 disables). Default is 1 for 'run' and 1000 for 'serve'.")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", parents=[machine], help="Run one program and print its result as a JSON line.")
+    run_parser.add_argument("program", help="Path of the Assembly file to execute, or '-' to read it from standard input.")
+    inputs = run_parser.add_mutually_exclusive_group()
+    inputs.add_argument("--input", default="", help="Input queue (integers separated by commas or spaces).")
+    inputs.add_argument("--input-file", help="File containing the input queue, or '-' to read it from standard input.")
+
+    serve_parser = commands.add_parser("serve", parents=[machine], help="Read jobs as JSON lines and write one JSON result line per job.")
+    serve_parser.add_argument("--socket", help="Listen on this Unix socket path instead of standard input/output.")
+
+    args = parser.parse_args(argv)
+    defaults = {"word_digits": args.word_digits, "address_digits": args.address_digits, "max_steps": args.max_steps}
+    if args.memory_size is not None:
+        defaults["memory_size"] = args.memory_size
+    if args.alloc_sample_interval is None:
+        # 'run' executes a single program, which would never be sampled with a larger interval.
+        args.alloc_sample_interval = 1 if args.command == "run" else 1000
+    elif args.alloc_sample_interval < 0:
+        parser.error("--alloc-sample-interval must not be negative")
+    stats = None
+    if args.stats or args.stats_file:
+        stats = LMCStats(args.alloc_sample_interval)
+
+    if args.command == "serve":
+        if args.socket:
+            serve_socket(args.socket, defaults, stats, args.stats_file)
+            return EXIT_OK
+        sys.stdin.reconfigure(errors="replace")  # Invalid UTF-8 fails its line instead of the server
+        return serve_stream(sys.stdin, sys.stdout, defaults, stats, args.stats_file)
+
+    if args.program == "-" and args.input_file == "-":
+        parser.error("the program and the input queue cannot both be read from standard input")
+    try:
+        job = {"program": args.program, "source": _read_text(args.program)}
+        job["input"] = parse_input(_read_text(args.input_file) if args.input_file else args.input)
+    except (OSError, ValueError) as e:
+        result = {"program": args.program, "status": "error", "error_type": type(e).__name__, "error": str(e)}
+    else:
+        result = run_job(job, defaults, stats)
+    sys.stdout.write(json.dumps(result) + "\n")
+    if args.stats_file:
+        stats.writePrometheus(args.stats_file)
+    return EXIT_OK if result["status"] == "ok" else EXIT_FAILURE
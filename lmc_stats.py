@@ -0,0 +1,188 @@
+# RICCARDO SAMARITAN SM3201396
+
+import os
+import time
+
+class LMCStats:
+    """
+    Collects execution statistics for LMC runs: instructions executed, wall time,
+    instructions per second, peak queue lengths and, for a sample of runs, memory
+    usage measured with tracemalloc.
+
+    tracemalloc does not count allocations that are freed again, so a sampled run reports
+    the blocks and bytes still allocated when it ends (retained) and the peak number of bytes
+    allocated at any point during the run, which is where short-lived objects show up.
+
+    A single LMCStats object can be shared by many LMC instances to aggregate their runs.
+    """
+    PROMETHEUS_WRITE_INTERVAL = 1.0  # Minimum seconds between two writes by writePrometheusIfDue
+
+    def __init__(self, allocation_sample_interval=1000):
+        """
+        Initializes empty statistics.
+
+        :param allocation_sample_interval: Measure allocations on one run out of this many
+                                           (1 measures every run, 0 or None disables sampling).
+                                           A traced run is about 8x slower, so sampling keeps the
+                                           average cost low.
+        :raises ValueError: If the interval is negative.
+        """
+        if allocation_sample_interval is not None and allocation_sample_interval < 0:
+            raise ValueError("Allocation sample interval must not be negative.")
+        self.allocation_sample_interval = allocation_sample_interval
+        self.runs = 0  # Completed runs
+        self.instructions = 0  # Instructions executed over all runs
+        self.wall_time = 0.0  # Seconds spent executing over all runs
+        self.max_input_queue_length = 0  # Peak input queue length over all runs
+        self.max_output_queue_length = 0  # Peak output queue length over all runs
+        self.sampled_runs = 0  # Runs whose allocations were measured
+        self.retained_blocks = 0  # Memory blocks still allocated at the end of the sampled runs
+        self.last_run = None  # Statistics of the most recent run (see recordRun)
+        self.last_sampled_run = None  # Statistics of the most recent run with allocation data
+        self._next_write = 0.0  # time.monotonic() after which writePrometheusIfDue writes again
+
+    @property
+    def instructions_per_second(self):
+        """Gets the average execution speed over all runs."""
+        return self.instructions / self.wall_time if self.wall_time > 0 else 0.0
+
+    def beginRun(self, lmc):
+        """
+        Starts measuring a run of the given LMC. Must be followed by endRun, even if the run fails.
+
+        :param lmc: The LMC about to execute a program.
+        :returns: A token to pass to endRun.
+        """
+        interval = self.allocation_sample_interval
+        # Samples runs interval, 2*interval, ...
+        sample = bool(interval) and (self.runs + 1) % interval == 0
+        input_length = len(lmc.input_queue.items)
+        if sample:
+            # Imported here: tracemalloc pulls in several modules, which only sampled runs should pay for.
+            import tracemalloc
+            sample = not tracemalloc.is_tracing()  # Never interferes with tracing started by someone else
+            if sample:
+                tracemalloc.start()
+        return (time.perf_counter(), input_length, sample)
+
+    def endRun(self, token, lmc, instructions):
+        """
+        Finishes measuring a run started with beginRun and records it.
+
+        During a run the input queue can only shrink and the output queue can only grow,
+        so their peak lengths are the lengths at the start and at the end of the run.
+
+        :param token: The value returned by beginRun.
+        :param lmc: The LMC that executed the program.
+        :param instructions: Number of instructions executed during the run.
+        """
+        wall_time = time.perf_counter() - token[0]
+        retained_blocks = retained_bytes = peak_bytes = None
+        if token[2]:
+            import tracemalloc
+            # Tracing started with the run, so everything traced was allocated during it.
+            retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            retained_blocks = len(tracemalloc.take_snapshot().traces)
+            tracemalloc.stop()
+        self.recordRun(instructions, wall_time, token[1], len(lmc.output_queue.items),
+                       retained_blocks, retained_bytes, peak_bytes)
+
+    def recordRun(self, instructions, wall_time, input_queue_peak, output_queue_peak,
+                  retained_blocks=None, retained_bytes=None, peak_bytes=None):
+        """
+        Adds a run to the statistics.
+
+        :param instructions: Number of instructions executed.
+        :param wall_time: Execution time in seconds.
+        :param input_queue_peak: Peak length of the input queue.
+        :param output_queue_peak: Peak length of the output queue.
+        :param retained_blocks: Memory blocks allocated during the run and still alive at its end, if sampled.
+        :param retained_bytes: Size in bytes of those blocks, if sampled.
+        :param peak_bytes: Peak memory allocated during the run in bytes, if sampled.
+        """
+        self.runs += 1
+        self.instructions += instructions
+        self.wall_time += wall_time
+        self.max_input_queue_length = max(self.max_input_queue_length, input_queue_peak)
+        self.max_output_queue_length = max(self.max_output_queue_length, output_queue_peak)
+        self.last_run = {
+            "instructions": instructions,
+            "wall_time": wall_time,
+            "instructions_per_second": instructions / wall_time if wall_time > 0 else 0.0,
+            "input_queue_peak": input_queue_peak,
+            "output_queue_peak": output_queue_peak,
+            "retained_blocks": retained_blocks,
+            "retained_bytes": retained_bytes,
+            "peak_bytes": peak_bytes,
+        }
+        if retained_blocks is not None:
+            self.sampled_runs += 1
+            self.retained_blocks += retained_blocks
+            self.last_sampled_run = self.last_run
+
+    def toPrometheus(self, prefix="lmc"):
+        """
+        Formats the statistics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names.
+        :returns: The metrics as a string.
+        """
+        metrics = [
+            ("runs_total", "counter", "Number of completed program runs.", self.runs),
+            ("instructions_total", "counter", "Instructions executed over all runs.", self.instructions),
+            ("run_seconds_total", "counter", "Wall time spent executing programs.", self.wall_time),
+            ("instructions_per_second", "gauge", "Average execution speed over all runs.", self.instructions_per_second),
+            ("input_queue_peak_length", "gauge", "Peak input queue length over all runs.", self.max_input_queue_length),
+            ("output_queue_peak_length", "gauge", "Peak output queue length over all runs.", self.max_output_queue_length),
+            ("allocation_sampled_runs_total", "counter", "Runs whose allocations were measured with tracemalloc.", self.sampled_runs),
+            ("retained_blocks_total", "counter", "Memory blocks still allocated at the end of the sampled runs.", self.retained_blocks),
+        ]
+        if self.last_run is not None:
+            metrics += [
+                ("last_run_instructions", "gauge", "Instructions executed by the last run.", self.last_run["instructions"]),
+                ("last_run_seconds", "gauge", "Wall time of the last run.", self.last_run["wall_time"]),
+                ("last_run_instructions_per_second", "gauge", "Execution speed of the last run.", self.last_run["instructions_per_second"]),
+                ("last_run_input_queue_peak_length", "gauge", "Peak input queue length of the last run.", self.last_run["input_queue_peak"]),
+                ("last_run_output_queue_peak_length", "gauge", "Peak output queue length of the last run.", self.last_run["output_queue_peak"]),
+            ]
+        if self.last_sampled_run is not None:
+            metrics += [
+                ("last_sampled_run_retained_blocks", "gauge", "Memory blocks still allocated at the end of the last sampled run.", self.last_sampled_run["retained_blocks"]),
+                ("last_sampled_run_retained_bytes", "gauge", "Bytes still allocated at the end of the last sampled run.", self.last_sampled_run["retained_bytes"]),
+                ("last_sampled_run_peak_bytes", "gauge", "Peak memory allocated during the last sampled run.", self.last_sampled_run["peak_bytes"]),
+            ]
+
+        lines = []
+        for name, kind, help_text, value in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def writePrometheus(self, path, prefix="lmc"):
+        """
+        Writes the statistics to a file in the Prometheus text format. The file is replaced
+        atomically, so collectors never read a partially written file.
+
+        :param path: Path of the file to write.
+        :param prefix: Prefix of the metric names.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.toPrometheus(prefix))
+        os.replace(tmp_path, path)
+        self._next_write = time.monotonic() + self.PROMETHEUS_WRITE_INTERVAL
+
+    def writePrometheusIfDue(self, path, prefix="lmc"):
+        """
+        Writes the statistics like writePrometheus, but at most once every
+        PROMETHEUS_WRITE_INTERVAL seconds, so it can be called after every run.
+
+        :param path: Path of the file to write.
+        :param prefix: Prefix of the metric names.
+        :returns: True if the file was written.
+        """
+        if time.monotonic() < self._next_write:
+            return False
+        self.writePrometheus(path, prefix)
+        return True
@@ -1,10 +1,20 @@
 # RICCARDO SAMARITAN SM3201396
 
+from lmc_config import LMCConfig
 from processor import LMCProcessor
 import argparse
+import sys
 from pathlib import Path
 
-def main():
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Non-interactive commands for scripts and job runners: 'run' executes one program and prints
+    # its result as a JSON line, 'serve' keeps processing JSON jobs from stdin or a Unix socket.
+    if argv and argv[0] in ("run", "serve"):
+        from lmc_runner import main as runner_main
+        return runner_main(argv)
 
     # Parse command-line arguments, specifying the program to execute, the input queue, and the execution mode. 
     # If no execution mode is specified, the program will execute the entire program by default.
@@ -12,16 +22,24 @@ def main():
     parser.add_argument("--program", required=True, help="Name of the Assembly file to execute (located in the 'tests' folder).")
     parser.add_argument("--input", help="Input queue (comma-separated integers).", default="")
     parser.add_argument("--mode", choices=["all", "steps"], default="all", help="Execution mode: 'all' (entire program) or 'steps' (step-by-step execution). Default mode is 'all'.")
-    args = parser.parse_args()
+    parser.add_argument("--word-digits", type=int, default=3, help="Number of decimal digits in a memory word. Default is 3.")
+    parser.add_argument("--address-digits", type=int, default=2, help="Number of decimal digits in an address. Default is 2.")
+    parser.add_argument("--memory-size", type=int, default=None, help="Number of memory cells. Default is every address that fits in --address-digits.")
+    args = parser.parse_args(argv)
+
+    try:
+        config = LMCConfig(args.word_digits, args.address_digits, args.memory_size)
+    except ValueError as e:
+        parser.error(str(e))
 
     try:
         # Check if the specified program file exists
         if not Path(f"./tests/{args.program}").exists():
             print("Error: The specified file does not exist.")
-            return
+            return 1
 
         # Initialize the processor with the provided program file
-        processor = LMCProcessor(f"./tests/{args.program}")
+        processor = LMCProcessor(f"./tests/{args.program}", config)
         instructions = processor.loadAndNormalizeInstructions()
 
         # Resolve labels in the Assembly program
@@ -44,9 +62,9 @@ def main():
         # EXECUTION PHASE
         if args.mode == "all":
             # Execute the entire program
-            processor.executeProgram()
+            succeeded = processor.executeProgram()
             print("Program finished with the following output queue:", processor.getOutputQueue())
-            input("Press ENTER to inspect the LMC\n")
+            pause("Press ENTER to inspect the LMC\n")
             # Display a summary of the LMC state
             print(processor.getLmcSummary())
 
@@ -56,18 +74,27 @@ def main():
                 # Display the current state of the LMC
                 output = processor.getLmcSummary()
                 print(output)
-                input("Press ENTER to execute the next step...")
+                pause("Press ENTER to execute the next step...")
                 # Execute the next instruction
                 processor.executeNextInstruction()
             print("Program finished with the following output queue:", processor.getOutputQueue())
+            succeeded = True
 
     except ValueError:
         # Handle invalid input format (non-integer values)
         print("Error: Please provide integers separated by commas.")
-        return
+        return 1
     except Exception as e:
         # Handle unexpected errors
         print(f"Error: {e}")
+        return 1
+
+    return 0 if succeeded else 1
+
+def pause(prompt):
+    # Waits for ENTER only when a user is at the terminal, so the interactive modes can also be scripted.
+    if sys.stdin.isatty():
+        input(prompt)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,10 +1,13 @@
 # RICCARDO SAMARITAN SM3201396
 
+from lmc_config import DEFAULT_CONFIG
+
 class MemoryCell:
     """
     Represents a memory cell that can store either data or an instruction.
     """
-    def __init__(self, content=None, opcode=None, address=None):
+    def __init__(self, content=None, opcode=None, address=None, config=DEFAULT_CONFIG):
+        self._config = config
         if content is not None:
             self._validate_content(content)
             self._content = content
@@ -13,7 +16,7 @@ class MemoryCell:
         elif opcode is not None and address is not None:
             self._validate_opcode(opcode)
             self._validate_address(address)
-            self._content = (opcode * 100) + address
+            self._content = config.encode(opcode, address)
             self._opcode = opcode
             self._address = address
         else:
@@ -24,15 +27,15 @@ class MemoryCell:
         if not isinstance(content, int):
             raise ValueError("Content must be an integer.")
 
-    @staticmethod
-    def _validate_opcode(opcode):
-        if not isinstance(opcode, int) or not (0 <= opcode <= 9):
-            raise ValueError("Opcode must be an integer between 0 and 9.")
+    def _validate_opcode(self, opcode):
+        max_opcode = self._config.max_opcode
+        if not isinstance(opcode, int) or not (0 <= opcode <= max_opcode):
+            raise ValueError(f"Opcode must be an integer between 0 and {max_opcode}.")
 
-    @staticmethod
-    def _validate_address(address):
-        if not isinstance(address, int) or not (0 <= address <= 99):
-            raise ValueError("Address must be an integer between 0 and 99.")
+    def _validate_address(self, address):
+        max_address = self._config.max_address
+        if not isinstance(address, int) or not (0 <= address <= max_address):
+            raise ValueError(f"Address must be an integer between 0 and {max_address}.")
 
     @property
     def content(self):
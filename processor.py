@@ -2,6 +2,7 @@
 
 from assembler import Assembler
 from lmc import LMC
+from lmc_config import DEFAULT_CONFIG
 from lmc_exceptions import EmptyInputQueueException, HaltException
 
 class LMCProcessor:
@@ -9,15 +10,17 @@ class LMCProcessor:
     LMCProcessor orchestrates the process of loading, parsing, and executing assembly instructions
     using the Little Man Computer (LMC) model.
     """
-    def __init__(self, filename):
+    def __init__(self, filename, config=DEFAULT_CONFIG):
         """
         Initialize the LMCProcessor with the specified assembly file.
 
         :param filename: The name of the file containing the assembly code.
+        :param config: The LMCConfig describing the machine to assemble for and run on.
         """
         self.filename = filename
-        self.assembler = Assembler(filename)  # Assembler instance for handling assembly operations.
-        self.lmc = LMC()  # Little Man Computer instance for execution.
+        self.config = config
+        self.assembler = Assembler(filename, config)  # Assembler instance for handling assembly operations.
+        self.lmc = LMC(config)  # Little Man Computer instance for execution.
 
     def loadAndNormalizeInstructions(self):
         """
@@ -27,6 +30,15 @@ class LMCProcessor:
         """
         return self.assembler.loadInstructionsFromFile()
 
+    def loadAndNormalizeSource(self, source):
+        """
+        Loads and normalizes instructions from assembly source code given as a string.
+
+        :param source: The assembly code.
+        :returns: List of normalized instructions.
+        """
+        return self.assembler.loadInstructionsFromLines(source.splitlines())
+
     def processLabels(self, instructions):
         """
         Identifies and resolves labels in the assembly instructions, replacing them with memory addresses.
@@ -57,14 +69,7 @@ class LMCProcessor:
         :param instruction: The instruction to parse.
         :returns: Machine code corresponding to the instruction.
         """
-        machine_code = None
-        if len(instruction) == 2:  # Action instruction with operand.
-            machine_code = self.assembler.parseActionInstruction(instruction)
-        elif len(instruction) == 1:  # Input/Output instruction.
-            machine_code = self.assembler.parseIoInstruction(instruction)
-        else:
-            raise ValueError("Invalid instruction format.")  # Handle unexpected instruction format.
-        return machine_code
+        return self.assembler.convertInstructionToMachineCode(instruction)
 
     def initializeLmcMemory(self, machine_codes, input_data=None):
         """
@@ -80,15 +85,36 @@ class LMCProcessor:
     def executeProgram(self):
         """
         Runs the LMC program to completion, handling potential exceptions.
+
+        :returns: True if the program halted normally, False if it was stopped by an error.
         """
         try:
             self.lmc.executeProgram()
+            return True
         except EmptyInputQueueException as e:
             print(f"Error: {e}")
         except HaltException as e:
             print(f"LMC halted: {e}")
         except Exception as e:
             print(f"Unexpected error: {e}")
+        return False
+
+    def enableStats(self, stats=None):
+        """
+        Enables the collection of execution statistics on the LMC.
+
+        :param stats: The LMCStats to record runs into (default: a new LMCStats).
+        :returns: The LMCStats in use.
+        """
+        return self.lmc.enableStats(stats)
+
+    def getStats(self):
+        """
+        Retrieves the execution statistics of the LMC.
+
+        :returns: The LMCStats in use, or None if statistics are not enabled.
+        """
+        return self.lmc.stats
 
     def isProgramRunning(self):
         """
@@ -124,13 +150,14 @@ class LMCProcessor:
             memory=self.lmc.memory,
             output_queue=self.lmc.output_queue,
             input_queue=self.lmc.input_queue,
+            address_digits=self.config.address_digits,
         )
 
 class LMCSummary:
     """
     Represents the state of the Little Man Computer (LMC) at a specific point in time.
     """
-    def __init__(self, program_counter, accumulator, memory, output_queue, input_queue):
+    def __init__(self, program_counter, accumulator, memory, output_queue, input_queue, address_digits=2):
         """
         Initializes the Output object with the LMC's state.
 
@@ -139,12 +166,14 @@ class LMCSummary:
         :param memory: Current state of memory cells.
         :param output_queue: Current state of the output queue.
         :param input_queue: Current state of the input queue.
+        :param address_digits: Number of digits used to print memory addresses.
         """
         self.program_counter = program_counter
         self.accumulator = accumulator
         self.memory = memory
         self.output_queue = output_queue
         self.input_queue = input_queue
+        self.address_digits = address_digits
 
     def __str__(self):
         """
@@ -152,7 +181,7 @@ class LMCSummary:
 
         :returns: Formatted string summarizing the LMC state.
         """
-        memory_state = "\n".join([f"{i:02d}: {cell.content}" for i, cell in enumerate(self.memory)])
+        memory_state = "\n".join([f"{i:0{self.address_digits}d}: {cell.content}" for i, cell in enumerate(self.memory)])
 
         return (
             f"~~~ LMC State ~~~\n"
@@ -0,0 +1,98 @@
+# RICCARDO SAMARITAN SM3201396
+
+import unittest
+from pathlib import Path
+
+from lmc import LMC
+from lmc_config import DEFAULT_CONFIG, LMCConfig
+from memory_cell import MemoryCell
+from processor import LMCProcessor
+
+PROGRAMS = Path(__file__).parent
+
+
+def run_file(name, input_data, config=DEFAULT_CONFIG):
+    processor = LMCProcessor(str(PROGRAMS / name), config)
+    instructions = processor.loadAndNormalizeInstructions()
+    machine_codes = processor.convertResolvedInstructionsToMachineCode(processor.processLabels(instructions))
+    processor.initializeLmcMemory(machine_codes, input_data)
+    processor.lmc.executeProgram()
+    return processor
+
+
+class LMCConfigTest(unittest.TestCase):
+
+    def test_default_is_classic_lmc(self):
+        self.assertEqual(DEFAULT_CONFIG.memory_size, 100)
+        self.assertEqual(DEFAULT_CONFIG.max_value, 999)
+        self.assertEqual(DEFAULT_CONFIG.max_address, 99)
+        self.assertEqual(DEFAULT_CONFIG.max_opcode, 9)
+
+    def test_big_lmc_limits(self):
+        config = LMCConfig(word_digits=6, address_digits=4)
+        self.assertEqual(config.memory_size, 10000)
+        self.assertEqual(config.max_value, 999999)
+        self.assertEqual(config.max_address, 9999)
+        self.assertEqual(config.max_opcode, 99)
+
+    def test_encode_decode(self):
+        self.assertEqual(DEFAULT_CONFIG.encode(9, 1), 901)
+        self.assertEqual(DEFAULT_CONFIG.decode(902), (9, 2))
+        config = LMCConfig(6, 4)
+        self.assertEqual(config.encode(9, 1), 90001)
+        self.assertEqual(config.decode(51234), (5, 1234))
+
+    def test_invalid_configurations(self):
+        with self.assertRaises(ValueError):
+            LMCConfig(word_digits=2, address_digits=2)
+        with self.assertRaises(ValueError):
+            LMCConfig(address_digits=0)
+        with self.assertRaises(ValueError):
+            LMCConfig(memory_size=101)
+        with self.assertRaises(ValueError):
+            LMCConfig(memory_size=0)
+        with self.assertRaises(ValueError):
+            LMCConfig(3, 2, True)
+        with self.assertRaises(ValueError):
+            LMCConfig(True, 0)
+
+    def test_equality(self):
+        self.assertEqual(LMCConfig(), DEFAULT_CONFIG)
+        self.assertEqual(hash(LMCConfig()), hash(DEFAULT_CONFIG))
+        self.assertNotEqual(LMCConfig(6, 4), DEFAULT_CONFIG)
+
+    def test_memory_cell_uses_config_limits(self):
+        with self.assertRaises(ValueError):
+            MemoryCell(opcode=1, address=100)
+        cell = MemoryCell(opcode=1, address=1234, config=LMCConfig(6, 4))
+        self.assertEqual(cell.content, 11234)
+
+    def test_lmc_memory_size(self):
+        lmc = LMC(LMCConfig(6, 4, memory_size=500))
+        self.assertEqual(len(lmc.memory), 500)
+        with self.assertRaises(IndexError):
+            lmc.validateMemoryAddress(500)
+
+
+class ConfiguredExecutionTest(unittest.TestCase):
+
+    def test_counting_on_big_lmc(self):
+        processor = run_file("counting.lmc", [5], LMCConfig(word_digits=6, address_digits=4))
+        self.assertEqual(processor.getOutputQueue(), [5, 4, 3, 2, 1, 0])
+        self.assertEqual(len(processor.lmc.memory), 10000)
+
+    def test_big_lmc_matches_default(self):
+        for name, input_data in [("fibonacci.lmc", [5]), ("multiplication.lmc", [13, 13])]:
+            default = run_file(name, input_data)
+            big = run_file(name, input_data, LMCConfig(6, 4))
+            self.assertEqual(big.getOutputQueue(), default.getOutputQueue())
+
+    def test_arithmetic_wraps_at_word_size(self):
+        lmc = LMC(LMCConfig(4, 2))
+        lmc.initializeMemory([(5, 4), (1, 4), (9, 2), (0, 0), (None, 9000)])
+        lmc.executeProgram()
+        self.assertEqual(lmc.output_queue.items, [8000])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+# RICCARDO SAMARITAN SM3201396
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import lmc_runner
+from lmc_config import LMCConfig
+from lmc_runner import EXIT_FAILURE, EXIT_OK, run_job, run_program, serve_stream
+
+PROGRAMS = Path(__file__).parent
+ROOT = PROGRAMS.parent
+
+
+def source(name):
+    return (PROGRAMS / name).read_text()
+
+
+class RunProgramTest(unittest.TestCase):
+
+    def test_successful_run(self):
+        result = run_program(source("fibonacci.lmc"), [5])
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(result["output"], [0, 1, 1, 2, 3])
+        self.assertEqual(result["steps"], 78)
+
+    def test_big_lmc(self):
+        result = run_program(source("counting.lmc"), [5], LMCConfig(word_digits=6, address_digits=4))
+        self.assertEqual(result["output"], [5, 4, 3, 2, 1, 0])
+
+    def test_runtime_error(self):
+        result = run_program(source("counting.lmc"), [])
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "EmptyInputQueueException")
+
+    def test_step_limit(self):
+        result = run_program(source("counting.lmc"), [999], max_steps=10)
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "StepLimitExceededException")
+        self.assertEqual(result["steps"], 10)
+
+    def test_assembly_errors_are_reported(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            unknown_instruction = run_program("A B C\nHLT")
+            unknown_label = run_program("ADD NOPE\nHLT")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(unknown_instruction["error_type"], "InstructionNotFoundException")
+        self.assertEqual(unknown_label["error_type"], "LabelNotFoundException")
+
+
+class RunJobTest(unittest.TestCase):
+
+    def test_program_path_and_id(self):
+        result = run_job({"id": 7, "program": str(PROGRAMS / "multiplication.lmc"), "input": "13,13"})
+        self.assertEqual(result["id"], 7)
+        self.assertEqual(result["output"], [169])
+
+    def test_defaults(self):
+        result = run_job({"source": source("counting.lmc"), "input": [2]},
+                         {"word_digits": 6, "address_digits": 4})
+        self.assertEqual(result["output"], [2, 1, 0])
+
+    def test_invalid_fields(self):
+        for job in [
+            {},
+            {"source": "HLT", "input": [1, "x"]},
+            {"source": "HLT", "input": {"a": 1}},
+            {"source": "HLT", "max_steps": "5"},
+            {"source": "HLT", "word_digits": "3"},
+            {"source": "HLT", "memory_size": 1.5},
+            {"program": str(PROGRAMS / "missing.lmc")},
+        ]:
+            result = run_job(job)
+            self.assertEqual(result["status"], "error", job)
+
+
+class ServeTest(unittest.TestCase):
+
+    def test_one_json_line_per_job(self):
+        jobs = "\n".join([
+            json.dumps({"id": 1, "source": source("counting.lmc"), "input": [1]}),
+            "",
+            "not json",
+            json.dumps({"id": 2, "source": "A B C\nHLT"}),
+        ]) + "\n"
+        outfile = io.StringIO()
+        exit_code = serve_stream(io.StringIO(jobs), outfile)
+        results = [json.loads(line) for line in outfile.getvalue().splitlines()]
+        self.assertEqual(exit_code, EXIT_FAILURE)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["output"], [1, 0])
+        self.assertEqual(results[1]["status"], "error")
+        self.assertEqual(results[2]["id"], 2)
+
+    def test_all_jobs_succeed(self):
+        jobs = json.dumps({"source": source("counting.lmc"), "input": [1]}) + "\n"
+        self.assertEqual(serve_stream(io.StringIO(jobs), io.StringIO()), EXIT_OK)
+
+
+class ServeSocketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "lmc.sock")
+        self.server = subprocess.Popen([sys.executable, "main.py", "serve", "--socket", self.path], cwd=ROOT)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.path):
+            self.assertLess(time.monotonic(), deadline, "server did not start")
+            time.sleep(0.05)
+
+    def tearDown(self):
+        self.server.terminate()
+        self.server.wait(10)
+        self.directory.cleanup()
+
+    def connect(self):
+        client = socket.socket(socket.AF_UNIX)
+        client.settimeout(10)
+        client.connect(self.path)
+        self.addCleanup(client.close)
+        return client.makefile("rwb")
+
+    def test_concurrent_clients_and_invalid_bytes(self):
+        first = self.connect()
+        second = self.connect()
+        first.write(json.dumps({"id": 1, "source": source("counting.lmc"), "input": [1]}).encode() + b"\n")
+        first.flush()
+        self.assertEqual(json.loads(first.readline())["output"], [1, 0])
+
+        # The first connection stays open while the second one is served.
+        second.write(b"\xff\xfe\n" + json.dumps({"id": 2, "source": "HLT"}).encode() + b"\n")
+        second.flush()
+        self.assertEqual(json.loads(second.readline())["status"], "error")
+        self.assertEqual(json.loads(second.readline())["id"], 2)
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def run_main(self, argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exit_code = lmc_runner.main(argv)
+        return exit_code, [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def test_run_exit_codes(self):
+        exit_code, results = self.run_main(["run", str(PROGRAMS / "fibonacci.lmc"), "--input", "5"])
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(results[0]["output"], [0, 1, 1, 2, 3])
+
+        exit_code, results = self.run_main(["run", str(PROGRAMS / "counting.lmc")])
+        self.assertEqual(exit_code, EXIT_FAILURE)
+        self.assertEqual(results[0]["status"], "error")
+
+    def test_run_big_lmc(self):
+        exit_code, results = self.run_main(["run", str(PROGRAMS / "counting.lmc"), "--input", "3",
+                                            "--word-digits", "6", "--address-digits", "4"])
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(results[0]["output"], [3, 2, 1, 0])
+
+    def test_run_samples_allocations_by_default(self):
+        exit_code, results = self.run_main(["run", str(PROGRAMS / "counting.lmc"), "--input", "3", "--stats"])
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertIsNotNone(results[0]["stats"]["peak_bytes"])
+
+    def test_negative_sample_interval_is_rejected(self):
+        with self.assertRaises(SystemExit) as raised, redirect_stderr(io.StringIO()):
+            lmc_runner.main(["run", str(PROGRAMS / "counting.lmc"), "--stats", "--alloc-sample-interval", "-3"])
+        self.assertEqual(raised.exception.code, 2)
+
+    def interactive(self, *args):
+        return subprocess.run([sys.executable, "main.py", *args], cwd=ROOT, stdin=subprocess.DEVNULL,
+                              capture_output=True, text=True)
+
+    def test_interactive_mode_exit_codes(self):
+        self.assertEqual(self.interactive("--program", "fibonacci.lmc", "--input", "5").returncode, 0)
+        self.assertEqual(self.interactive("--program", "counting.lmc").returncode, 1)
+        self.assertEqual(self.interactive("--program", "reverse.lmc", "--input", "5").returncode, 1)
+        self.assertEqual(self.interactive("--program", "missing.lmc").returncode, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
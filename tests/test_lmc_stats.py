@@ -0,0 +1,163 @@
+# RICCARDO SAMARITAN SM3201396
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from lmc import LMC
+from lmc_exceptions import EmptyInputQueueException, StepLimitExceededException
+from lmc_runner import assemble, serve_stream
+from lmc_stats import LMCStats
+from processor import LMCProcessor
+
+PROGRAMS = Path(__file__).parent
+
+CASES = [
+    ("fibonacci.lmc", [5]),
+    ("multiplication.lmc", [13, 13]),
+    ("counting.lmc", [50]),
+    ("counting.lmc", []),
+    ("squares.lmc", [4]),
+    ("reverse.lmc", [1, 2, 3, 0]),
+    ("exec.lmc", [901, 902, 705, 600, 0, 4, 5, 6, 7, 8, 9, 0]),
+]
+
+
+def make_lmc(name, input_data, stats=None):
+    lmc = LMC()
+    lmc.initializeMemory(assemble((PROGRAMS / name).read_text()), input_data)
+    if stats is not None:
+        lmc.enableStats(stats)
+    return lmc
+
+
+def final_state(lmc, method):
+    error = None
+    try:
+        method()
+    except Exception as e:
+        error = (type(e).__name__, str(e))
+    return (lmc.output_queue.items, lmc.accumulator, lmc.program_counter, lmc.halted, error,
+            [cell.content for cell in lmc.memory], lmc.instructions_executed)
+
+
+class StatsOnOffTest(unittest.TestCase):
+
+    def test_same_results_with_and_without_stats(self):
+        for name, input_data in CASES:
+            plain = make_lmc(name, input_data)
+            measured = make_lmc(name, input_data, LMCStats(allocation_sample_interval=1))
+            self.assertEqual(final_state(plain, plain.executeProgram),
+                             final_state(measured, measured.executeProgram), name)
+
+    def test_run_and_stepwise_count_the_same_instructions(self):
+        for name, input_data in CASES:
+            lmc = make_lmc(name, input_data)
+            final_state(lmc, lmc.executeProgram)
+
+            stepwise = make_lmc(name, input_data, LMCStats())
+
+            def run_stepwise():
+                while not stepwise.halted:
+                    stepwise.executeProgramStepwise()
+
+            final_state(stepwise, run_stepwise)
+            self.assertEqual(stepwise.instructions_executed, lmc.instructions_executed, name)
+            self.assertEqual(stepwise.stats.last_run["instructions"], lmc.instructions_executed, name)
+
+
+class LMCStatsTest(unittest.TestCase):
+
+    def test_counts_and_queue_peaks(self):
+        stats = LMCStats()
+        lmc = make_lmc("counting.lmc", [3], stats)
+        lmc.executeProgram()
+        self.assertEqual(stats.runs, 1)
+        self.assertEqual(stats.instructions, 16)
+        self.assertEqual(stats.last_run["input_queue_peak"], 1)
+        self.assertEqual(stats.last_run["output_queue_peak"], 4)
+        self.assertGreater(stats.instructions_per_second, 0)
+
+    def test_failed_run_is_recorded(self):
+        stats = LMCStats()
+        lmc = make_lmc("counting.lmc", [], stats)
+        with self.assertRaises(EmptyInputQueueException):
+            lmc.executeProgram()
+        self.assertEqual(stats.runs, 1)
+        self.assertEqual(stats.last_run["instructions"], 0)
+
+    def test_halted_lmc_records_nothing(self):
+        stats = LMCStats(allocation_sample_interval=1)
+        lmc = make_lmc("counting.lmc", [1], stats)
+        lmc.executeProgram()
+        lmc.executeProgram()
+        self.assertEqual(stats.runs, 1)
+        self.assertEqual(stats.sampled_runs, 1)
+
+    def test_step_limit(self):
+        lmc = make_lmc("counting.lmc", [999], LMCStats())
+        with self.assertRaises(StepLimitExceededException):
+            lmc.executeProgram(max_steps=10)
+        self.assertEqual(lmc.instructions_executed, 10)
+
+    def test_allocation_sampling_interval(self):
+        stats = LMCStats(allocation_sample_interval=3)
+        for _ in range(6):
+            make_lmc("fibonacci.lmc", [5], stats).executeProgram()
+        self.assertEqual(stats.sampled_runs, 2)
+        self.assertIsNotNone(stats.last_sampled_run["peak_bytes"])
+        self.assertEqual(stats.runs, 6)
+
+    def test_negative_interval_is_rejected(self):
+        with self.assertRaises(ValueError):
+            LMCStats(allocation_sample_interval=-3)
+
+    def test_processor_stats(self):
+        processor = LMCProcessor(str(PROGRAMS / "fibonacci.lmc"))
+        stats = processor.enableStats()
+        instructions = processor.loadAndNormalizeInstructions()
+        processor.initializeLmcMemory(
+            processor.convertResolvedInstructionsToMachineCode(processor.processLabels(instructions)), [5])
+        self.assertTrue(processor.executeProgram())
+        self.assertIs(processor.getStats(), stats)
+        self.assertEqual(stats.instructions, 78)
+
+
+class PrometheusTest(unittest.TestCase):
+
+    def test_text_format(self):
+        stats = LMCStats(allocation_sample_interval=1)
+        make_lmc("counting.lmc", [3], stats).executeProgram()
+        text = stats.toPrometheus()
+        self.assertIn("# TYPE lmc_runs_total counter\nlmc_runs_total 1\n", text)
+        self.assertIn("lmc_instructions_total 16\n", text)
+        self.assertIn("lmc_last_sampled_run_peak_bytes ", text)
+        for line in text.splitlines():
+            if not line.startswith("#"):
+                name, value = line.split(" ")
+                self.assertTrue(name.startswith("lmc_"))
+                float(value)
+
+    def test_writes_are_throttled(self):
+        stats = LMCStats()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lmc.prom")
+            self.assertTrue(stats.writePrometheusIfDue(path))
+            self.assertFalse(stats.writePrometheusIfDue(path))
+            stats._next_write = 0.0
+            self.assertTrue(stats.writePrometheusIfDue(path))
+
+    def test_serve_writes_stats_file_without_stats_object(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lmc.prom")
+            jobs = json.dumps({"program": str(PROGRAMS / "counting.lmc"), "input": [2]}) + "\n"
+            serve_stream(io.StringIO(jobs), io.StringIO(), stats_file=path)
+            with open(path) as f:
+                self.assertIn("lmc_instructions_total 12\n", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()